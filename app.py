@@ -1,16 +1,45 @@
 from __future__ import annotations
 
+import heapq
+import json
 import math
 import re
-from collections import Counter
+import threading
+from collections import Counter, OrderedDict
 from dataclasses import dataclass
+from functools import lru_cache
+from hashlib import blake2b
+from operator import itemgetter
 from typing import Dict, List, Tuple
 
 from flask import Flask, jsonify, render_template, request
+from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
 
-app = Flask(__name__)
+try:
+    import orjson
+except ImportError:  # optional: faster JSON for large request/response bodies
+    orjson = None
 
+app = Flask(__name__)
+# Reject oversized bodies, and cap the text we run the regex passes over
+MAX_BODY_BYTES = 1_000_000
+MAX_CONTENT_CHARS = 500_000
+# Werkzeug rejects a larger Content-Length up front, but silently cuts a streamed body off
+# at this limit; allowing one extra byte lets the route apply MAX_BODY_BYTES to both alike
+app.config["MAX_CONTENT_LENGTH"] = MAX_BODY_BYTES + 1
+
+WHITESPACE_RE = re.compile(r"\s+")
 WORD_RE = re.compile(r"[A-Za-z0-9']+")
+# Words, or a sentence terminator run followed by whitespace/end (simple, good enough for MVP)
+SCAN_RE = re.compile(r"([A-Za-z0-9']+)|[.!?]+(?:\s|$)")
+PARA_SPLIT_RE = re.compile(r"\n\s*\n")
+# Line starts as str.splitlines() sees them; whitespace here excludes those
+# line breaks so a match never spans two lines
+LINE_BREAKS = r"\n\r\x0b\x0c\x1c-\x1e\x85\u2028\u2029"
+MD_HEADING_RE = re.compile(
+    rf"(?:^|(?<=[{LINE_BREAKS}]))[^\S{LINE_BREAKS}]*(#{{1,6}})[^\S{LINE_BREAKS}]+\S"
+)
+HTML_HEADING_RE = re.compile(r"<h([1-6])\b", re.IGNORECASE)
 
 @dataclass
 class AnalysisResult:
@@ -24,71 +53,121 @@ class AnalysisResult:
 def normalize_text(s: str) -> str:
     # Normalize whitespace and common “smart” quotes
     s = s.replace("\u2019", "'").replace("\u201c", '"').replace("\u201d", '"')
-    s = re.sub(r"\s+", " ", s).strip()
+    s = WHITESPACE_RE.sub(" ", s).strip()
     return s
 
 
-def tokenize_words(text: str) -> List[str]:
-    return [w.lower() for w in WORD_RE.findall(text)]
+def scan_text(text: str) -> Tuple[List[str], int]:
+    """
+    Tokenize words and count sentences in a single pass over normalized text.
+    A sentence ends at a run of . ! ? followed by whitespace or the end of the text.
+    """
+    words: List[str] = []
+    sentence_count = 0
+    sentence_start = 0
+
+    for m in SCAN_RE.finditer(text):
+        word = m.group(1)
+        if word is not None:
+            words.append(word.lower())
+            continue
+        # Sentence terminator: only count it if it closes a non-empty sentence
+        if m.start() > sentence_start:
+            sentence_count += 1
+        sentence_start = m.end()
+
+    if len(text) > sentence_start:
+        sentence_count += 1
+
+    return words, sentence_count
 
 
-def split_sentences(text: str) -> List[str]:
-    # Simple sentence splitting: good enough for MVP
-    parts = re.split(r"[.!?]+(?:\s|$)", text.strip())
-    return [p.strip() for p in parts if p.strip()]
+# Byte tables for syllable counting: drop everything but ASCII letters, then
+# classify each letter as vowel ("v") or consonant ("c")
+NON_ALPHA = bytes(i for i in range(256) if not (65 <= i <= 90 or 97 <= i <= 122))
+VOWEL_MAP = bytes(ord("v") if chr(i).lower() in "aeiouy" else ord("c") for i in range(256))
 
 
 def count_syllables(word: str) -> int:
     # Simple English syllable estimator (works OK for readability scoring)
-    w = re.sub(r"[^a-z]", "", word.lower())
+    # Only the lowercase letters matter, so "Word", "word" and "WORD!" share a cache entry
+    return _count_syllables_clean(word.lower().encode("ascii", "ignore").translate(None, NON_ALPHA))
+
+
+@lru_cache(maxsize=65536)
+def _count_syllables_clean(w: bytes) -> int:
     if not w:
         return 0
 
-    vowels = "aeiouy"
-    syllables = 0
-    prev_vowel = False
-
-    for ch in w:
-        is_vowel = ch in vowels
-        if is_vowel and not prev_vowel:
-            syllables += 1
-        prev_vowel = is_vowel
+    # Each consonant->vowel transition starts a new vowel group
+    syllables = (b"c" + w.translate(VOWEL_MAP)).count(b"cv")
 
-    # Silent 'e'
-    if w.endswith("e") and syllables > 1 and not w.endswith(("le", "ye")):
+    # Silent 'e' (mirrored by SILENT_E_WORD_RE; keep the two in sync)
+    if w.endswith(b"e") and syllables > 1 and not w.endswith((b"le", b"ye")):
         syllables -= 1
 
+    # Only vowel-less words can be below 1 here (mirrored by NO_VOWEL_WORD_RE)
     return max(1, syllables)
 
 
-def flesch_reading_ease(words: List[str], sentences: List[str]) -> float:
-    if not words or not sentences:
+# Bulk counting joins words with NUL, so keep that byte while dropping other non-letters
+NON_ALPHA_KEEP_NUL = NON_ALPHA.replace(b"\x00", b"")
+# Mirrors `max(1, syllables)` in _count_syllables_clean: a non-empty word with no vowel
+# group scores 0 vowel-group starts but counts as 1 syllable
+NO_VOWEL_WORD_RE = re.compile(rb"(?<![a-z])[b-df-hj-np-tv-xz]+(?![a-z])")
+# Mirrors the silent 'e' rule: word ends in "e" but not "le"/"ye", and has more than one
+# vowel group (a vowel, then consonants, then the final vowel run ending in "e")
+SILENT_E_WORD_RE = re.compile(
+    rb"(?<![a-z])[a-z]*[aeiouy][b-df-hj-np-tv-xz]+[aeiouy]*e(?<![ly]e)(?![a-z])"
+)
+# Mostly-distinct long documents are cheaper to tally in bulk than word by word
+BULK_SYLLABLE_MIN_WORDS = 5000
+
+
+def count_syllables_bulk(words: List[str]) -> int:
+    """
+    Total syllables for tokenized words, same result as summing count_syllables.
+    Counts vowel groups across one joined buffer, then applies the
+    one-syllable minimum and silent 'e' rules with whole-buffer regex counts.
+    """
+    buf = "\x00".join(words).lower().encode("ascii", "ignore").translate(None, NON_ALPHA_KEEP_NUL)
+    syllables = (b"c" + buf.translate(VOWEL_MAP)).count(b"cv")
+    syllables += len(NO_VOWEL_WORD_RE.findall(buf))
+    syllables -= len(SILENT_E_WORD_RE.findall(buf))
+    return syllables
+
+
+def flesch_reading_ease(words: List[str], freq: Counter, sentence_count: int) -> float:
+    word_count = len(words)
+    if not word_count or not sentence_count:
         return 0.0
 
-    syllable_count = sum(count_syllables(w) for w in words)
-    wps = len(words) / max(1, len(sentences))  # words per sentence
-    spw = syllable_count / max(1, len(words))  # syllables per word
+    if word_count >= BULK_SYLLABLE_MIN_WORDS and len(freq) * 2 > word_count:
+        syllable_count = count_syllables_bulk(words)
+    else:
+        # Syllables depend only on the word, so count each distinct word once and weight it
+        syllable_count = sum(count_syllables(w) * n for w, n in freq.items())
+    wps = word_count / sentence_count  # words per sentence
+    spw = syllable_count / word_count  # syllables per word
 
     # Flesch Reading Ease
     score = 206.835 - (1.015 * wps) - (84.6 * spw)
     return round(score, 1)
 
 
+# Common bands, highest threshold first
+SCORE_BANDS = (
+    (90, "Very easy"),
+    (80, "Easy"),
+    (70, "Fairly easy"),
+    (60, "Standard"),
+    (50, "Fairly difficult"),
+    (30, "Difficult"),
+)
+
+
 def score_band(flesch: float) -> str:
-    # Common bands
-    if flesch >= 90:
-        return "Very easy"
-    if flesch >= 80:
-        return "Easy"
-    if flesch >= 70:
-        return "Fairly easy"
-    if flesch >= 60:
-        return "Standard"
-    if flesch >= 50:
-        return "Fairly difficult"
-    if flesch >= 30:
-        return "Difficult"
-    return "Very difficult"
+    return next((label for threshold, label in SCORE_BANDS if flesch >= threshold), "Very difficult")
 
 
 def extract_headings(text: str) -> Dict[str, int]:
@@ -97,63 +176,101 @@ def extract_headings(text: str) -> Dict[str, int]:
     - Markdown: #, ##, ### ...
     - HTML: <h1>, <h2>, ...
     """
-    md_counts = Counter()
-    html_counts = Counter()
-
-    for line in text.splitlines():
-        m = re.match(r"^\s*(#{1,6})\s+\S+", line)
-        if m:
-            level = len(m.group(1))
-            md_counts[f"h{level}"] += 1
-
-    for level in range(1, 7):
-        html_counts[f"h{level}"] = len(re.findall(fr"<h{level}\b", text, flags=re.IGNORECASE))
-
-    combined = Counter()
-    combined.update(md_counts)
-    combined.update(html_counts)
+    counts = Counter(f"h{len(m.group(1))}" for m in MD_HEADING_RE.finditer(text))
+    counts.update(f"h{m.group(1)}" for m in HTML_HEADING_RE.finditer(text))
 
     # Ensure all levels exist
-    return {f"h{i}": int(combined.get(f"h{i}", 0)) for i in range(1, 7)}
-
-
-def keyword_metrics(words: List[str], target: str, related: str) -> Tuple[Dict, Dict]:
+    return {f"h{i}": counts[f"h{i}"] for i in range(1, 7)}
+
+
+def token_forms(token: str) -> Tuple[str, ...]:
+    # Spellings in the text that count as the token: quoted ("'seo'") and possessive ("seo's")
+    return tuple(f"{pre}{token}{suf}" for pre in ("", "'") for suf in ("", "'", "'s", "'s'"))
+
+
+@lru_cache(maxsize=1024)
+def _target_pattern(target: str) -> re.Pattern:
+    # Phrase match on word boundaries, for targets WORD_RE can't tokenize losslessly
+    return re.compile(rf"\b{re.escape(target)}\b", re.IGNORECASE)
+
+
+def count_phrase(words: List[str], freq: Counter, phrase: List[str]) -> int:
+    # Non-overlapping occurrences of a token sequence. Candidate starts are found with
+    # list.index for each form of the first token that actually occurs in the text.
+    k = len(phrase)
+    forms = [set(token_forms(t)) for t in phrase]
+    starts: List[int] = []
+    for form in forms[0]:
+        if form not in freq:
+            continue
+        i = 0
+        while True:
+            try:
+                i = words.index(form, i)
+            except ValueError:
+                break
+            starts.append(i)
+            i += 1
+    starts.sort()
+
+    count = 0
+    next_free = 0
+    last_start = len(words) - k
+    for i in starts:
+        if i < next_free or i > last_start:
+            continue
+        if all(words[i + j] in forms[j] for j in range(1, k)):
+            count += 1
+            next_free = i + k
+    return count
+
+
+def keyword_metrics(
+    words: List[str], freq: Counter, target: str, related: str, flat: bool = False
+) -> Tuple[Dict, Dict]:
     total_words = len(words)
-    freq = Counter(words)
 
     target_clean = target.strip().lower()
     related_list = [r.strip().lower() for r in related.split(",") if r.strip()]
 
-    # Target count supports multi-word phrases by checking normalized text too
-    # For density we’ll estimate via phrase matches; fall back to token counts for 1-word.
+    # Target count supports multi-word phrases by matching the target's tokens in sequence.
+    # Single-word targets (the common case) are a few Counter lookups.
+    target_tokens = WORD_RE.findall(target_clean)
     target_phrase_count = 0
-    if target_clean:
-        joined = " ".join(words)
-        # phrase match on word boundaries
-        target_phrase_count = len(
-            re.findall(rf"\b{re.escape(target_clean)}\b", joined, flags=re.IGNORECASE)
-        )
+    if "".join(target_tokens) != WHITESPACE_RE.sub("", target_clean):
+        # Tokenizing dropped characters (e.g. "c++"); word-boundary match like before
+        target_phrase_count = len(_target_pattern(target_clean).findall(" ".join(words)))
+    elif len(target_tokens) == 1:
+        target_phrase_count = sum(freq.get(f, 0) for f in token_forms(target_tokens[0]))
+    elif target_tokens:
+        target_phrase_count = count_phrase(words, freq, target_tokens)
 
     density = 0.0
     if total_words > 0:
         # density based on occurrences vs total words (approx)
         density = (target_phrase_count / total_words) * 100
 
-    related_counts = {r: freq.get(r, 0) for r in related_list}
-
-    top_words = [
-        (w, c) for (w, c) in freq.most_common(25)
-        if len(w) > 2 and not w.isdigit()
-    ]
+    # Bounded heap over the useful terms; same order as a stable sort by count
+    top_words = heapq.nlargest(
+        15,
+        ((w, c) for (w, c) in freq.items() if len(w) > 2 and not w.isdigit()),
+        key=itemgetter(1),
+    )
 
     kw = {
         "target_keyword": target_clean,
         "target_count": target_phrase_count,
         "target_density_percent": round(density, 2),
         "related_keywords": related_list,
-        "related_counts": related_counts,
-        "top_terms": top_words[:15],
     }
+    if flat:
+        # Parallel lists instead of a dict and (term, count) pairs: fewer objects to build and serialize
+        kw["related_counts"] = [freq.get(r, 0) for r in related_list]
+        kw["top_terms_words"] = [w for w, _ in top_words]
+        kw["top_terms_counts"] = [c for _, c in top_words]
+    else:
+        kw["related_counts"] = {r: freq.get(r, 0) for r in related_list}
+        kw["top_terms"] = top_words
 
     # SEO-ish heuristics (simple, not “magic”)
     flags = {
@@ -165,9 +282,9 @@ def keyword_metrics(words: List[str], target: str, related: str) -> Tuple[Dict,
 
 
 def make_suggestions(
-    text: str,
+    paragraphs: List[str],
     words: List[str],
-    sentences: List[str],
+    sentence_count: int,
     headings: Dict[str, int],
     kw: Dict,
     kw_flags: Dict,
@@ -176,7 +293,14 @@ def make_suggestions(
 ) -> List[str]:
     suggestions: List[str] = []
     word_count = len(words)
-    sentence_count = len(sentences)
+    h1 = headings.get("h1", 0)
+    h2 = headings.get("h2", 0)
+    h3 = headings.get("h3", 0)
+    target = kw.get("target_keyword", "")
+    mt = meta_title.strip()
+    md = meta_desc.strip()
+    mt_len = len(mt)
+    md_len = len(md)
 
     if word_count < 300:
         suggestions.append("Add more depth. Aim for at least 300 to 800 words for most posts.")
@@ -189,18 +313,17 @@ def make_suggestions(
             suggestions.append("Shorten sentences. Average sentence length is a bit high.")
 
     # Headings
-    if headings.get("h1", 0) == 0:
+    if h1 == 0:
         suggestions.append("Add one clear H1 title (or a top-level heading) to define the page topic.")
-    elif headings.get("h1", 0) > 1:
+    elif h1 > 1:
         suggestions.append("Use only one H1. Convert extra H1s into H2s.")
 
-    if headings.get("h2", 0) == 0:
+    if h2 == 0:
         suggestions.append("Add H2 subheadings to break up sections and improve scan-ability.")
-    if headings.get("h3", 0) == 0 and word_count >= 700:
+    if h3 == 0 and word_count >= 700:
         suggestions.append("Add some H3 subheadings for details inside each section.")
 
     # Keyword guidance
-    target = kw.get("target_keyword", "")
     if target:
         if not kw_flags.get("has_target", False):
             suggestions.append("Include your target keyword at least once, ideally in the first 100 words.")
@@ -212,15 +335,12 @@ def make_suggestions(
         suggestions.append("Add a target keyword to get keyword density and placement feedback.")
 
     # Meta title / description checks
-    mt = meta_title.strip()
-    md = meta_desc.strip()
-
     if not mt:
         suggestions.append("Add a meta title. Keep it clear and specific.")
     else:
-        if len(mt) < 35:
+        if mt_len < 35:
             suggestions.append("Meta title may be short. Many titles perform well around 45 to 60 characters.")
-        if len(mt) > 65:
+        if mt_len > 65:
             suggestions.append("Meta title may be long. Consider shortening to about 60 characters.")
 
         if target and target not in mt.lower():
@@ -229,24 +349,23 @@ def make_suggestions(
     if not md:
         suggestions.append("Add a meta description. Summarize the value in 1 to 2 sentences.")
     else:
-        if len(md) < 90:
+        if md_len < 90:
             suggestions.append("Meta description may be short. Many descriptions perform well around 120 to 160 characters.")
-        if len(md) > 170:
+        if md_len > 170:
             suggestions.append("Meta description may be long. Consider trimming to about 160 characters.")
 
         if target and target not in md.lower():
             suggestions.append("Try including the target keyword in the meta description, if it fits naturally.")
 
-    # Paragraph length heuristic
-    paras = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
-    long_paras = [p for p in paras if len(p.split()) > 110]
-    if long_paras:
+    # Paragraph length heuristic; stops at the first long paragraph
+    has_long_para = any(len(p.split()) > 110 for p in paragraphs)
+    if has_long_para:
         suggestions.append("Break up long paragraphs. Aim for tighter blocks so it’s easier to read.")
 
     return suggestions
 
 
-def analyze(payload: Dict) -> AnalysisResult:
+def analyze(payload: Dict, flat: bool = False) -> AnalysisResult:
     raw_text = payload.get("content", "") or ""
     target_keyword = payload.get("target_keyword", "") or ""
     related = payload.get("related_keywords", "") or ""
@@ -254,19 +373,22 @@ def analyze(payload: Dict) -> AnalysisResult:
     meta_desc = payload.get("meta_description", "") or ""
 
     text = normalize_text(raw_text)
-    words = tokenize_words(text)
-    sentences = split_sentences(text)
+    words, sentence_count = scan_text(text)
 
     # Basic stats
     word_count = len(words)
     char_count = len(text)
-    sentence_count = len(sentences)
-    paragraph_count = len([p for p in re.split(r"\n\s*\n", raw_text) if p.strip()])
+    # Split once; make_suggestions reuses the list for its paragraph length check
+    paragraphs = [p for p in PARA_SPLIT_RE.split(raw_text) if p.strip()]
+    paragraph_count = len(paragraphs)
 
     avg_words_per_sentence = round(word_count / max(1, sentence_count), 2)
 
+    # One word frequency table shared by readability and keyword metrics
+    freq = Counter(words)
+
     # Readability
-    flesch = flesch_reading_ease(words, sentences)
+    flesch = flesch_reading_ease(words, freq, sentence_count)
     readability = {
         "flesch_reading_ease": flesch,
         "level": score_band(flesch),
@@ -277,11 +399,11 @@ def analyze(payload: Dict) -> AnalysisResult:
     heading_counts = extract_headings(raw_text)
 
     # Keywords
-    kw, kw_flags = keyword_metrics(words, target_keyword, related)
+    kw, kw_flags = keyword_metrics(words, freq, target_keyword, related, flat)
 
     # Suggestions
     suggestions = make_suggestions(
-        raw_text, words, sentences, heading_counts, kw, kw_flags, meta_title, meta_desc
+        paragraphs, words, sentence_count, heading_counts, kw, kw_flags, meta_title, meta_desc
     )
 
     return AnalysisResult(
@@ -303,24 +425,86 @@ def index():
     return render_template("index.html")
 
 
+# Serialized /analyze responses keyed by a hash of the request payload.
+# The UI re-sends identical content while the user tweaks other fields.
+_RESPONSE_CACHE: "OrderedDict[bytes, bytes]" = OrderedDict()
+RESPONSE_CACHE_MAX = 512
+_RESPONSE_CACHE_LOCK = threading.Lock()
+
+
+def _json_loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj, sort_keys: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+    return json.dumps(obj, sort_keys=sort_keys).encode("utf-8")
+
+
+def _payload_key(payload: Dict, flat: bool) -> bytes:
+    canonical = _json_dumps(payload, sort_keys=True)
+    if flat:
+        canonical += b"|flat"
+    return blake2b(canonical, digest_size=16).digest()
+
+
 @app.route("/analyze", methods=["POST"])
 def analyze_route():
     try:
-        payload = request.get_json(force=True, silent=False)
+        data = request.get_data()
+        if len(data) > MAX_BODY_BYTES:
+            raise RequestEntityTooLarge()
+
+        try:
+            payload = _json_loads(data)
+        except ValueError:
+            payload = None
         if not isinstance(payload, dict):
             return jsonify({"error": "Invalid JSON payload"}), 400
 
-        result = analyze(payload)
-        return jsonify({
+        content = payload.get("content")
+        if isinstance(content, str) and len(content) > MAX_CONTENT_CHARS:
+            return jsonify({"error": f"Content too long (max {MAX_CONTENT_CHARS} characters)"}), 413
+
+        # ?flat=1 returns keyword term/count data as parallel lists
+        flat = request.args.get("flat") == "1"
+        key = _payload_key(payload, flat)
+        with _RESPONSE_CACHE_LOCK:
+            body = _RESPONSE_CACHE.get(key)
+            if body is not None:
+                _RESPONSE_CACHE.move_to_end(key)
+        if body is not None:
+            return app.response_class(body, mimetype="application/json")
+
+        result = analyze(payload, flat)
+        body = _json_dumps({
             "stats": result.stats,
             "keywords": result.keywords,
             "headings": result.headings,
             "readability": result.readability,
             "suggestions": result.suggestions,
         })
+
+        with _RESPONSE_CACHE_LOCK:
+            _RESPONSE_CACHE[key] = body
+            if len(_RESPONSE_CACHE) > RESPONSE_CACHE_MAX:
+                _RESPONSE_CACHE.popitem(last=False)
+        return app.response_class(body, mimetype="application/json")
+    except HTTPException:
+        # Let Flask's error handlers produce the proper status (e.g. 413 below)
+        raise
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
+@app.errorhandler(RequestEntityTooLarge)
+def request_too_large(e):
+    return jsonify({"error": "Request body too large"}), 413
+
+
 if __name__ == "__main__":
-    app.run(debug=True)
+    # Development server only; use wsgi.py with gunicorn for real traffic
+    app.run()
@@ -40,7 +40,7 @@ async function analyze() {
 
   setStatus("Analyzing...");
   try {
-    const res = await fetch("/analyze", {
+    const res = await fetch("/analyze?flat=1", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify(payload)
@@ -57,12 +57,15 @@ async function analyze() {
     $("headings").textContent = pretty(data.headings);
 
     const kw = data.keywords || {};
+    const related = kw.related_keywords || [];
+    const relatedCounts = kw.related_counts || [];
+    const termCounts = kw.top_terms_counts || [];
     const kwView = {
       target_keyword: kw.target_keyword,
       target_count: kw.target_count,
       target_density_percent: kw.target_density_percent,
-      related_counts: kw.related_counts,
-      top_terms: kw.top_terms
+      related_counts: Object.fromEntries(related.map((r, i) => [r, relatedCounts[i]])),
+      top_terms: (kw.top_terms_words || []).map((w, i) => [w, termCounts[i]])
     };
     $("keywords").textContent = pretty(kwView);
 
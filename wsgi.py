@@ -0,0 +1,4 @@
+from app import app
+
+# WSGI entry point, e.g. `gunicorn -w $(nproc) -k sync --preload wsgi:application`
+application = app